@@ -1,12 +1,14 @@
 
 # Caviar Event Calculator — v4.2 (compatibility fix)
-# - Fixes pandas Styler compatibility: use hide_index() if available, else hide(axis='index'), else no-hide fallback.
+# - Fixes pandas Styler compatibility: per-event summary tables are plain markdown (bold Optimal mix row), no Styler needed.
 # - Keeps v4.1 features: rounded-up "Total cost ($)" in Top Mixes, bold Optimal mix row, label & help text updates.
 
 import math
+import functools
 import urllib.parse
 import streamlit as st
 import pandas as pd
+import numpy as np
 from pathlib import Path
 from datetime import datetime
 from io import BytesIO
@@ -22,6 +24,17 @@ try:
 except Exception:
     REPORTLAB_AVAILABLE = False
 
+# JIT for the mix enumerator (optional; falls back to the NumPy grid)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except Exception:
+    NUMBA_AVAILABLE = False
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
 # ---------------- Brand Config ----------------
 APP_TITLE = "Caviar Event Calculator"
 BRAND_NAME = "La Pearle' Caviar"
@@ -40,249 +53,302 @@ for p in LOCAL_LOGO_PATHS:
         FOUND_LOCAL_LOGO = p
         break
 
-st.set_page_config(page_title=APP_TITLE, page_icon="🥂", layout="centered")
-
-# ---------------- Sidebar: Brand + Strategy ----------------
-st.sidebar.header("Brand Settings")
-st.sidebar.caption("Tip: Put your logo at ./assets/la-pearle-logo.png in the repo to load automatically.")
-logo_url = st.sidebar.text_input("Logo URL (used if a local file isn't found)", "")
-brand_name = st.sidebar.text_input("Brand Name", BRAND_NAME)
-
-primary_hex = st.sidebar.color_picker("Primary (Gold)", PALETTE["gold"])
-accent_hex  = st.sidebar.color_picker("Accent (Navy)",  PALETTE["navy"])
-bg_hex      = st.sidebar.color_picker("Background",     "#FFFFFF")
-panel_hex   = st.sidebar.color_picker("Panel Background", PALETTE["pearl"])
-
-st.sidebar.markdown("---")
-st.sidebar.subheader("Mix Strategy")
-
-objective = st.sidebar.selectbox(
-    "Objective Mode",
-    ["Fewest tins (recommended)", "Balanced mix (cost + per-tin penalty)", "Cheapest only"],
-    help="Choose how the optimizer ranks mixes."
-)
-
-service_penalty = st.sidebar.number_input(
-    "Per‑tin service penalty ($) — used only in Balanced mix",
-    min_value=0.0, value=8.0, step=1.0
-)
-st.sidebar.caption(
-    "❓ **What is the per‑tin service penalty?** "
-    "It's a small artificial cost added **per tin** *only* in **Balanced mix** mode to reflect real‑world setup/serving effort. "
-    "A higher penalty gently pushes the optimizer toward **fewer/larger tins**. "
-    "It is **ignored** in 'Fewest tins' and 'Cheapest only' modes."
-)
-
-cap_125_share_on = st.sidebar.checkbox("Limit 125 g share of total grams", value=True)
-cap_125_share_pct = st.sidebar.slider("Max % of grams from 125 g", 20, 100, 60)
-
-st.sidebar.markdown("---")
-st.sidebar.subheader("Advanced Caps (Optional)")
-cap_250 = st.sidebar.number_input("Max 250 g tins", min_value=0, value=0, step=1, help="0 = no cap")
-cap_8   = st.sidebar.number_input("Max 8 oz tins",  min_value=0, value=0, step=1, help="0 = no cap")
-cap_125 = st.sidebar.number_input("Max 125 g tins", min_value=0, value=0, step=1, help="0 = no cap")
-
-top_k = st.sidebar.number_input("Only Show Top ___ Mixes", min_value=1, value=10, step=1)
-
-# ---------------- CSS ----------------
-st.markdown(f"""
-<style>
-:root {{
-  --primary: {primary_hex};
-  --accent:  {accent_hex};
-  --bg:      {bg_hex};
-  --panel:   {panel_hex};
-  --ink:     {PALETTE['ink']};
-}}
-[data-testid="stAppViewContainer"] > .main {{ background: var(--bg); }}
-.lp-banner {{
-  display:flex; align-items:center; gap:16px;
-  background: linear-gradient(90deg, var(--panel), #ffffff 70%);
-  padding: 14px 16px; border-radius: 16px; border: 1px solid #eee;
-  box-shadow: 0 1px 6px rgba(0,0,0,0.06);
-}}
-.lp-brand {{ font-size: 20px; font-weight: 700; color: var(--accent); }}
-.lp-chip  {{ display:inline-block; padding: 2px 8px; border-radius: 999px; background: var(--primary); color: white; font-size: 12px; }}
-.stButton>button {{ background: var(--primary); color:white; border:none; }}
-</style>
-""", unsafe_allow_html=True)
-
-# ---------------- Header ----------------
-col_logo, col_text = st.columns([1, 3])
-with col_logo:
-    if FOUND_LOCAL_LOGO:
-        st.image(FOUND_LOCAL_LOGO, use_container_width=True)
-    elif logo_url.strip():
-        st.image(logo_url, use_container_width=True)
-    else:
-        st.markdown("<div class='lp-chip'>Add your logo via sidebar</div>", unsafe_allow_html=True)
-with col_text:
-    st.markdown(f"""
-    <div class="lp-banner">
-      <div class="lp-brand">{brand_name}</div>
-      <div class="lp-chip">{APP_TITLE}</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-st.write("Compute the lowest‑tin‑count **mix** that meets your required grams for **one‑hour**, **two‑hour**, and **three‑hour** events (while balancing cost and overage).")
-
-# ---------------- Inputs ----------------
-st.markdown("### Event Inputs")
-col1, col2, col3 = st.columns(3)
-with col1:
-    guests = st.number_input("Guests", min_value=1, value=90, step=1)
-with col2:
-    grams_per_tasting = st.number_input("Grams per Tasting", min_value=1.0, value=3.0, step=0.5)
-with col3:
-    tastings_per_guest_1h = st.number_input("Tastings per Guest (1 hour)", min_value=0.5, value=2.0, step=0.25)
-
-c4, c5 = st.columns(2)
-with c4:
-    tastings_per_guest_2h = st.number_input("Tastings per Guest (2 hours)", min_value=0.5, value=2.75, step=0.25)
-with c5:
-    tastings_per_guest_3h = st.number_input("Tastings per Guest (3 hours)", min_value=0.5, value=3.5, step=0.25)
-
-st.markdown("### Tin Sizes & Prices")
-c1, c2, c3, c4 = st.columns(4)
-with c1:
-    grams_250 = st.number_input("250 g - grams", min_value=1, value=250, step=1)
-    price_250 = st.number_input("250 g - price ($)", min_value=0.0, value=345.0, step=0.01, format="%.2f")
-with c2:
-    grams_8 = st.number_input("8 oz - grams", min_value=1, value=227, step=1)
-    price_8 = st.number_input("8 oz - price ($)", min_value=0.0, value=312.0, step=0.01, format="%.2f")
-with c3:
-    grams_7 = st.number_input("7 oz - grams", min_value=1, value=198, step=1)
-    price_7 = st.number_input("7 oz - price ($)", min_value=0.0, value=273.0, step=0.01, format="%.2f")
-with c4:
-    grams_125 = st.number_input("125 g - grams", min_value=1, value=125, step=1)
-    price_125 = st.number_input("125 g - price ($)", min_value=0.0, value=127.57, step=0.01, format="%.2f")
-
 # ---------------- Core logic ----------------
+@st.cache_data(show_spinner=False, max_entries=64)
 def grams_required(guests, tastings, g_per_taste):
     return math.ceil(guests * tastings * g_per_taste)
 
-def optimize_and_rank(req_g,
-                      grams_250, price_250,
-                      grams_8, price_8,
-                      grams_7, price_7,
-                      grams_125, price_125,
-                      objective="Fewest tins (recommended)",
-                      service_penalty=8.0,
-                      cap_125_share_on=True, cap_125_share_pct=60,
-                      cap_250=0, cap_8=0, cap_125=0,
-                      top_k=10):
-    # bounds
-    max_250 = (cap_250 if cap_250 > 0 else math.ceil(req_g / grams_250) + 8)
-    max_8   = (cap_8   if cap_8   > 0 else math.ceil(req_g / grams_8) + 8)
-    max_125 = (cap_125 if cap_125 > 0 else math.ceil(req_g / grams_125) + 8)
-
-    combos = []
+@njit(cache=True)
+def _ceildiv(a, b):
+    # integer ceil(a / b): no float division or rounding (works on ints and int arrays)
+    return -(-a // b)
+
+@njit(cache=True)
+def _enumerate_mixes(req_g,
+                     grams_250, price_250,
+                     grams_8, price_8,
+                     grams_7, price_7,
+                     grams_125, price_125,
+                     cap_125_share_on, cap_125_share_pct,
+                     max_250, max_8, max_125):
+    # Same candidates as _enumerate_grid, as a compiled triple loop writing into preallocated arrays
+    size = (max_250 + 1) * (max_8 + 1) * (max_125 + 1)
+    x250a = np.empty(size, dtype=np.int64)
+    x8a = np.empty(size, dtype=np.int64)
+    x7a = np.empty(size, dtype=np.int64)
+    x125a = np.empty(size, dtype=np.int64)
+    purchased_a = np.empty(size, dtype=np.int64)
+    cost_a = np.empty(size, dtype=np.float64)
+    tins_a = np.empty(size, dtype=np.int64)
+    over_a = np.empty(size, dtype=np.int64)
+    n = 0
     for x250 in range(max_250 + 1):
         g250 = x250 * grams_250
         for x8 in range(max_8 + 1):
             g8 = x8 * grams_8
+            deficit = req_g - g250 - g8
+            # one division per (x250, x8): the 7 oz count only steps down as 125 g tins are added
+            x7 = _ceildiv(deficit, grams_7) if deficit > 0 else 0
             for x125 in range(max_125 + 1):
                 g125 = x125 * grams_125
+                while x7 > 0 and (x7 - 1) * grams_7 >= deficit - g125:
+                    x7 -= 1
                 grams_so_far = g250 + g8 + g125
-                if grams_so_far >= req_g:
-                    x7 = 0
-                    purchased = grams_so_far
-                else:
-                    need = req_g - grams_so_far
-                    x7 = math.ceil(need / grams_7)
-                    purchased = grams_so_far + x7 * grams_7
+                purchased = grams_so_far + x7 * grams_7
 
                 # share cap
-                if cap_125_share_on and purchased > 0:
-                    if (g125 / purchased) * 100.0 > cap_125_share_pct:
-                        continue
-
-                total_tins = x250 + x8 + x7 + x125
-                cost = x250*price_250 + x8*price_8 + x7*price_7 + x125*price_125
-                over = purchased - req_g
-
-                # Score by objective
-                if objective == "Cheapest only":
-                    score = (cost, over, total_tins)
-                elif objective == "Balanced mix (cost + per-tin penalty)":
-                    score = (cost + service_penalty * total_tins, over, total_tins)
-                else:  # Fewest tins (recommended)
-                    score = (total_tins, cost, over)
-
-                combos.append((score, total_tins, cost, over, x250, x8, x7, x125, purchased))
+                if cap_125_share_on and purchased > 0 and g125 * 100 > cap_125_share_pct * purchased:
+                    continue
+
+                x250a[n] = x250
+                x8a[n] = x8
+                x7a[n] = x7
+                x125a[n] = x125
+                purchased_a[n] = purchased
+                cost_a[n] = x250*price_250 + x8*price_8 + x7*price_7 + x125*price_125
+                tins_a[n] = x250 + x8 + x7 + x125
+                over_a[n] = purchased - req_g
+                n += 1
+    return x250a[:n], x8a[:n], x7a[:n], x125a[:n], purchased_a[:n], cost_a[:n], tins_a[:n], over_a[:n]
+
+def _grid_base(grams_250, price_250,
+               grams_8, price_8,
+               grams_125,
+               max_250, max_8, max_125):
+    # Requirement-independent part of the grid; built once and sliced per requirement
+    a = np.arange(max_250 + 1)[:, None, None]
+    b = np.arange(max_8 + 1)[None, :, None]
+    d = np.arange(max_125 + 1)[None, None, :]
+    G125 = d * grams_125
+    grams_so_far = a * grams_250 + b * grams_8 + G125
+    cost_250_8 = a*price_250 + b*price_8
+    return a, b, d, G125, grams_so_far, cost_250_8
+
+def _enumerate_grid(req_g,
+                    grams_7, price_7,
+                    price_125,
+                    cap_125_share_on, cap_125_share_pct,
+                    base, max_250, max_8, max_125):
+    # Enumerate every (x250, x8, x125) at once on a broadcast grid; 7 oz back-fills the remainder
+    n250, n8, n125 = max_250 + 1, max_8 + 1, max_125 + 1
+    a, b, d, G125, grams_so_far, cost_250_8 = base
+    a, b, d, G125 = a[:n250], b[:, :n8], d[:, :, :n125], G125[:, :, :n125]
+    cost_250_8 = cost_250_8[:n250, :n8]
+    grams_so_far = grams_so_far[:n250, :n8, :n125]
+    need = np.maximum(req_g - grams_so_far, 0)
+    x7 = _ceildiv(need, grams_7)
+    purchased = grams_so_far + x7 * grams_7
+    cost = cost_250_8 + x7*price_7 + d*price_125
+    tins = a + b + x7 + d
+    over = purchased - req_g
+
+    # share cap
+    mask = np.ones(tins.shape, dtype=bool)
+    if cap_125_share_on:
+        mask &= (purchased <= 0) | (G125 * 100 <= cap_125_share_pct * purchased)
+
+    # flatten feasible candidates (C order keeps the x250 → x8 → x125 enumeration order)
+    shape = tins.shape
+    x250a = np.broadcast_to(a, shape)[mask]
+    x8a   = np.broadcast_to(b, shape)[mask]
+    x125a = np.broadcast_to(d, shape)[mask]
+    return x250a, x8a, x7[mask], x125a, purchased[mask], cost[mask], tins[mask], over[mask]
+
+def _primary_score(objective, cost, tins, service_penalty):
+    if objective == "Cheapest only":
+        return cost
+    elif objective == "Balanced mix (cost + per-tin penalty)":
+        return cost + service_penalty * tins
+    return tins
+
+def _greedy_incumbent(req_g,
+                      grams_250, price_250,
+                      grams_8, price_8,
+                      grams_7, price_7,
+                      objective, service_penalty,
+                      cap_250, cap_8):
+    # All-250 / all-8 oz / all-7 oz fills (7 oz tops up any capped shortfall).
+    # No 125 g tins, so they always pass the share cap.
+    n250 = int(_ceildiv(req_g, grams_250))
+    n8   = int(_ceildiv(req_g, grams_8))
+    if cap_250 > 0:
+        n250 = min(n250, cap_250)
+    if cap_8 > 0:
+        n8 = min(n8, cap_8)
+    inc_tins, inc_score = None, None
+    for x250, x8 in ((n250, 0), (0, n8), (0, 0)):
+        x7 = int(_ceildiv(max(0, req_g - x250*grams_250 - x8*grams_8), grams_7))
+        tins = x250 + x8 + x7
+        cost = x250*price_250 + x8*price_8 + x7*price_7
+        score = _primary_score(objective, cost, tins, service_penalty)
+        inc_tins = tins if inc_tins is None else min(inc_tins, tins)
+        inc_score = score if inc_score is None else min(inc_score, score)
+    return inc_tins, inc_score
+
+def _max_counts(req_g, grams_250, grams_8, grams_125, cap_250, cap_8, cap_125):
+    # Outer search limits; _rank_mixes trims them further with its incumbent bound
+    # int(): _ceildiv keeps float inputs float, and range() / np.arange need integer bounds
+    max_250 = (cap_250 if cap_250 > 0 else int(_ceildiv(req_g, grams_250)) + 8)
+    max_8   = (cap_8   if cap_8   > 0 else int(_ceildiv(req_g, grams_8)) + 8)
+    max_125 = (cap_125 if cap_125 > 0 else int(_ceildiv(req_g, grams_125)) + 8)
+    return max_250, max_8, max_125
+
+def _rank_mixes(req_g, enumerate_mixes,
+                grams_250, price_250,
+                grams_8, price_8,
+                grams_7, price_7,
+                grams_125, price_125,
+                objective, service_penalty,
+                cap_250, cap_8, cap_125,
+                top_k):
+    # bounds
+    full = _max_counts(req_g, grams_250, grams_8, grams_125, cap_250, cap_8, cap_125)
+
+    # Branch-and-bound: a greedy incumbent bounds both the objective (for the best mix) and the
+    # tin count (for the fewest-tins alternatives). A dimension can stop at x once x tins alone
+    # exceed both bounds; anything pruned that way can be neither the best nor a top-N alternative.
+    tin_bound, score_bound = _greedy_incumbent(
+        req_g, grams_250, price_250, grams_8, price_8, grams_7, price_7,
+        objective, service_penalty, cap_250, cap_8
+    )
+    if objective == "Cheapest only":
+        units = (price_250, price_8, price_125)
+    elif objective == "Balanced mix (cost + per-tin penalty)":
+        units = (price_250 + service_penalty, price_8 + service_penalty, price_125 + service_penalty)
+    else:  # Fewest tins (recommended)
+        units = (1, 1, 1)
+
+    while True:
+        bounds = tuple(
+            m if u <= 0 else min(m, max(tin_bound, int(score_bound // u) + 1))
+            for m, u in zip(full, units)
+        )
+        x250a, x8a, x7a, x125a, purchased, cost, tins, over = enumerate_mixes(req_g, *bounds)
+        within = tins <= tin_bound
+        if within.sum() >= top_k:
+            keep = within | (_primary_score(objective, cost, tins, service_penalty) <= score_bound)
+            x250a, x8a, x7a, x125a = x250a[keep], x8a[keep], x7a[keep], x125a[keep]
+            purchased, cost, tins, over = purchased[keep], cost[keep], tins[keep], over[keep]
+            break
+        if bounds == full:
+            break
+        # not enough alternatives inside the tin bound yet; widen and retry
+        tin_bound += max(1, tin_bound // 2)
 
-    if not combos:
+    if tins.size == 0:
         return {"error": "No feasible mix under current caps/limits."}, []
 
-    # best by objective
-    combos.sort(key=lambda t: t[0])
-    best = combos[0]
+    # Score by objective
+    if objective == "Cheapest only":
+        score = (cost, over, tins)
+    elif objective == "Balanced mix (cost + per-tin penalty)":
+        score = (cost + service_penalty * tins, over, tins)
+    else:  # Fewest tins (recommended)
+        score = (tins, cost, over)
+
+    # best by objective: argmin on the primary key, tie-break only among the rows tied on it
+    # (lexsort keys run last → first; stable, so ties keep enumeration order)
+    tied = np.flatnonzero(score[0] == score[0].min())
+    i = tied[np.lexsort((score[2][tied], score[1][tied]))[0]]
     res_best = {
         "required_g": req_g,
-        "x250": best[4], "x8": best[5], "x7": best[6], "x125": best[7],
-        "purchased_g": best[8],
-        "overage_g": best[3],
-        "total_cost": best[2],
-        "total_tins": best[1],
+        "x250": int(x250a[i]), "x8": int(x8a[i]), "x7": int(x7a[i]), "x125": int(x125a[i]),
+        "purchased_g": int(purchased[i]),
+        "overage_g": int(over[i]),
+        "total_cost": float(cost[i]),
+        "total_tins": int(tins[i]),
     }
 
     # alternatives: top N by FEWEST TINS, cost, overage
-    alt_sorted = sorted(combos, key=lambda t: (t[1], t[2], t[3]))
-    alts = []
-    seen = set()
-    for t in alt_sorted:
-        mix_tuple = (t[4], t[5], t[6], t[7])  # unique by tin counts
-        if mix_tuple in seen:
-            continue
-        seen.add(mix_tuple)
-        alts.append({
-            "250 g": t[4], "8 oz": t[5], "7 oz": t[6], "125 g": t[7],
-            "Total grams": t[8], "Overage (g)": t[3],
-            "Total tins": t[1], "Total cost ($)": int(math.ceil(float(t[2])))
-        })
-        if len(alts) >= top_k:
-            break
+    # each (x250, x8, x125) cell is enumerated once and fixes x7, so mixes are already unique.
+    # Partition on tin count so only rows up to the k-th fewest tins get sorted.
+    k = min(top_k, tins.size)
+    pool = np.flatnonzero(tins <= np.partition(tins, k - 1)[k - 1])
+    top = pool[np.lexsort((over[pool], cost[pool], tins[pool]))][:k]
+    alts = [
+        {
+            "250 g": int(x250a[j]), "8 oz": int(x8a[j]), "7 oz": int(x7a[j]), "125 g": int(x125a[j]),
+            "Total grams": int(purchased[j]), "Overage (g)": int(over[j]),
+            "Total tins": int(tins[j]), "Total cost ($)": int(math.ceil(float(cost[j])))
+        }
+        for j in top
+    ]
 
     return res_best, alts
 
-def render_block(title, best):
+# Results are cached on their (scalar) inputs so reruns from unrelated widgets skip the search.
+@st.cache_data(show_spinner=False, max_entries=64)
+def optimize_and_rank_multi(req_list,
+                            grams_250, price_250,
+                            grams_8, price_8,
+                            grams_7, price_7,
+                            grams_125, price_125,
+                            objective="Fewest tins (recommended)",
+                            service_penalty=8.0,
+                            cap_125_share_on=True, cap_125_share_pct=60,
+                            cap_250=0, cap_8=0, cap_125=0,
+                            top_k=10):
+    # One (best, alts) per requirement. Everything but req_g is shared, so the NumPy path builds
+    # the grid once, sized for the largest requirement, and slices it for the smaller ones.
+    if NUMBA_AVAILABLE:
+        def enumerate_mixes(req_g, max_250, max_8, max_125):
+            return _enumerate_mixes(
+                req_g, grams_250, price_250, grams_8, price_8, grams_7, price_7, grams_125, price_125,
+                cap_125_share_on, cap_125_share_pct, max_250, max_8, max_125
+            )
+    else:
+        sizes = [_max_counts(r, grams_250, grams_8, grams_125, cap_250, cap_8, cap_125) for r in req_list]
+        base = _grid_base(grams_250, price_250, grams_8, price_8, grams_125, *map(max, zip(*sizes)))
+        def enumerate_mixes(req_g, max_250, max_8, max_125):
+            return _enumerate_grid(
+                req_g, grams_7, price_7, price_125,
+                cap_125_share_on, cap_125_share_pct, base, max_250, max_8, max_125
+            )
+
+    return [
+        _rank_mixes(
+            req_g, enumerate_mixes,
+            grams_250, price_250, grams_8, price_8, grams_7, price_7, grams_125, price_125,
+            objective, service_penalty, cap_250, cap_8, cap_125, top_k
+        )
+        for req_g in req_list
+    ]
+
+def optimize_and_rank(req_g,
+                      grams_250, price_250,
+                      grams_8, price_8,
+                      grams_7, price_7,
+                      grams_125, price_125,
+                      objective="Fewest tins (recommended)",
+                      service_penalty=8.0,
+                      cap_125_share_on=True, cap_125_share_pct=60,
+                      cap_250=0, cap_8=0, cap_125=0,
+                      top_k=10):
+    return optimize_and_rank_multi(
+        (req_g,), grams_250, price_250, grams_8, price_8, grams_7, price_7, grams_125, price_125,
+        objective=objective, service_penalty=service_penalty,
+        cap_125_share_on=cap_125_share_on, cap_125_share_pct=cap_125_share_pct,
+        cap_250=cap_250, cap_8=cap_8, cap_125=cap_125, top_k=top_k
+    )[0]
+
+# ---------------- Rendering ----------------
+def render_block(title, best, guests):
     st.markdown(f"#### {title}")
     if "error" in best:
         st.error(best["error"])
         return
-    df = pd.DataFrame({
-        "Metric": [
-            "Required grams",
-            "Optimal mix",
-            "Total grams purchased",
-            "Overage (g)",
-            "Total tins",
-            "Total cost",
-            "Cost per guest"
-        ],
-        "Value": [
-            f"{best['required_g']:,}",
-            f"{best['x250']} × 250 g, {best['x8']} × 8 oz, {best['x7']} × 7 oz, {best['x125']} × 125 g",
-            f"{best['purchased_g']:,}",
-            f"{best['overage_g']:,}",
-            f"{best['total_tins']}",
-            f"${best['total_cost']:,.2f}",
-            f"${best['total_cost']/max(1,guests):,.2f}",
-        ]
-    })
-    # Bold the "Optimal mix" row via Styler with cross-version hide index
-    def _bold_optimal(row):
-        return ['font-weight: bold' if row['Metric'] == 'Optimal mix' else '' for _ in row]
-    styler = df.style.apply(_bold_optimal, axis=1)
-    # hide index for older/newer pandas
-    try:
-        styler = styler.hide_index()
-    except Exception:
-        try:
-            styler = styler.hide(axis='index')
-        except Exception:
-            pass
-    st.dataframe(styler, use_container_width=True)
+    # Small fixed-format table: plain markdown (no DataFrame/Arrow round-trip), Optimal mix row in bold.
+    # "$" is escaped so Streamlit doesn't pair the two costs up as LaTeX.
+    rows = [
+        ("Required grams", f"{best['required_g']:,}"),
+        ("**Optimal mix**", f"**{best['x250']} × 250 g, {best['x8']} × 8 oz, {best['x7']} × 7 oz, {best['x125']} × 125 g**"),
+        ("Total grams purchased", f"{best['purchased_g']:,}"),
+        ("Overage (g)", f"{best['overage_g']:,}"),
+        ("Total tins", f"{best['total_tins']}"),
+        ("Total cost", f"\\${best['total_cost']:,.2f}"),
+        ("Cost per guest", f"\\${best['total_cost']/max(1,guests):,.2f}"),
+    ]
+    st.markdown("| Metric | Value |\n|---|---|\n" + "\n".join(f"| {k} | {v} |" for k, v in rows))
 
 def render_alternatives(title, alts, label="Top mixes (fewest tins first)"):
     if alts:
@@ -290,45 +356,8 @@ def render_alternatives(title, alts, label="Top mixes (fewest tins first)"):
         df2 = pd.DataFrame(alts)
         st.dataframe(df2, use_container_width=True, hide_index=True)
 
-# Required grams
-req_1h = grams_required(guests, tastings_per_guest_1h, grams_per_tasting)
-req_2h = grams_required(guests, tastings_per_guest_2h, grams_per_tasting)
-req_3h = grams_required(guests, tastings_per_guest_3h, grams_per_tasting)
-
-# Run optimizer
-best_1h, alt_1h = optimize_and_rank(
-    req_1h, grams_250, price_250, grams_8, price_8, grams_7, price_7, grams_125, price_125,
-    objective=objective, service_penalty=service_penalty,
-    cap_125_share_on=cap_125_share_on, cap_125_share_pct=cap_125_share_pct,
-    cap_250=cap_250, cap_8=cap_8, cap_125=cap_125, top_k=top_k
-)
-best_2h, alt_2h = optimize_and_rank(
-    req_2h, grams_250, price_250, grams_8, price_8, grams_7, price_7, grams_125, price_125,
-    objective=objective, service_penalty=service_penalty,
-    cap_125_share_on=cap_125_share_on, cap_125_share_pct=cap_125_share_pct,
-    cap_250=cap_250, cap_8=cap_8, cap_125=cap_125, top_k=top_k
-)
-best_3h, alt_3h = optimize_and_rank(
-    req_3h, grams_250, price_250, grams_8, price_8, grams_7, price_7, grams_125, price_125,
-    objective=objective, service_penalty=service_penalty,
-    cap_125_share_on=cap_125_share_on, cap_125_share_pct=cap_125_share_pct,
-    cap_250=cap_250, cap_8=cap_8, cap_125=cap_125, top_k=top_k
-)
-
-# ---------------- Results ----------------
-st.markdown("### Results")
-render_block("One-Hour Event", best_1h)
-render_alternatives("One-Hour Event", alt_1h)
-
-render_block("Two-Hour Event", best_2h)
-render_alternatives("Two-Hour Event", alt_2h)
-
-render_block("Three-Hour Event", best_3h)
-render_alternatives("Three-Hour Event", alt_3h)
-
 # ---------------- PDF Summary Sheet ----------------
-st.markdown("### Summary Sheet (PDF)")
-
+@functools.lru_cache(maxsize=32)
 def _hex_to_rgb01(hex_str):
     hex_str = hex_str.strip().lstrip("#")
     r = int(hex_str[0:2], 16) / 255.0
@@ -336,9 +365,15 @@ def _hex_to_rgb01(hex_str):
     b = int(hex_str[4:6], 16) / 255.0
     return r, g, b
 
-def generate_pdf(brand_name, logo_path_or_url, bg_hex, ink_hex, gold_hex,
+@st.cache_resource(show_spinner=False)
+def _get_image_reader(logo_path_or_url):
+    # Decode the logo once per path/URL rather than on every PDF; a failed read raises, so it isn't cached
+    return ImageReader(logo_path_or_url)
+
+def generate_pdf(brand_name, logo_reader, bg_hex, ink_hex, gold_hex,
                  guests, gpt, t1, t2, t3,
-                 best1, best2, best3):
+                 best1, best2, best3, as_of=None):
+    as_of = as_of or datetime.now()
     buf = BytesIO()
     c = canvas.Canvas(buf, pagesize=letter)
     width, height = letter
@@ -347,15 +382,14 @@ def generate_pdf(brand_name, logo_path_or_url, bg_hex, ink_hex, gold_hex,
     bg   = colors.Color(*_hex_to_rgb01(bg_hex))
     c.setFillColor(bg); c.rect(0, 0, width, height, stroke=0, fill=1)
     y = height - 72
-    if logo_path_or_url:
+    if logo_reader is not None:
         try:
-            img = ImageReader(logo_path_or_url)
             logo_w = 2.5 * inch
-            c.drawImage(img, (width - logo_w)/2, y - 1.0*inch, width=logo_w, preserveAspectRatio=True, mask='auto')
+            c.drawImage(logo_reader, (width - logo_w)/2, y - 1.0*inch, width=logo_w, preserveAspectRatio=True, mask='auto')
             y -= 1.1*inch
         except Exception:
             pass
-    today = datetime.now().strftime("%B %d, %Y")
+    today = as_of.strftime("%B %d, %Y")
     c.setFont("Helvetica-Bold", 18); c.setFillColor(gold)
     c.drawCentredString(width/2, y, "Caviar Event Summary"); y -= 24
     c.setFont("Helvetica", 10); c.setFillColor(ink)
@@ -400,34 +434,23 @@ def generate_pdf(brand_name, logo_path_or_url, bg_hex, ink_hex, gold_hex,
 
     c.setStrokeColor(gold); c.line(72, 72, width-72, 72)
     c.setFillColor(ink); c.setFont("Helvetica", 8)
-    c.drawCentredString(width/2, 58, "© " + str(datetime.now().year) + f" {brand_name}. All rights reserved.")
+    c.drawCentredString(width/2, 58, "© " + str(as_of.year) + f" {brand_name}. All rights reserved.")
     c.showPage(); c.save()
     pdf = buf.getvalue(); buf.close(); return pdf
 
-if not REPORTLAB_AVAILABLE:
-    st.info("To enable PDF export, add **reportlab** to your requirements.txt and redeploy.")
-else:
-    pdf_logo = FOUND_LOCAL_LOGO if FOUND_LOCAL_LOGO else (logo_url if logo_url.strip() else None)
-    if st.button("📄 Generate Summary Sheet"):
-        pdf_bytes = generate_pdf(
-            brand_name=brand_name, logo_path_or_url=pdf_logo,
-            bg_hex=panel_hex, ink_hex=PALETTE["ink"], gold_hex=primary_hex,
-            guests=guests, gpt=grams_per_tasting,
-            t1=tastings_per_guest_1h, t2=tastings_per_guest_2h, t3=tastings_per_guest_3h,
-            best1=best_1h, best2=best_2h, best3=best_3h
-        )
-        st.session_state["summary_pdf"] = pdf_bytes
-    if "summary_pdf" in st.session_state:
-        fname = f"Caviar_Event_Summary_{datetime.now().strftime('%Y-%m-%d')}.pdf"
-        st.download_button("⬇️ Download PDF", data=st.session_state["summary_pdf"], file_name=fname, mime="application/pdf")
-
-# ---------------- Actions ----------------
-st.markdown("### Actions")
-st.components.v1.html("""
-<script>function doPrint(){ window.print(); }</script>
-<button onclick="doPrint()" style="padding:8px 12px;border-radius:8px;border:1px solid #ccc;cursor:pointer;">🖨️ Print Results</button>
-""", height=60)
-
+# PDF bytes are cached on the inputs (best dicts as item tuples, the date so the header stays current)
+@st.cache_data(max_entries=16, show_spinner=False)
+def _build_pdf_bytes(brand_name, logo_path, bg_hex, ink_hex, gold_hex,
+                     guests, gpt, t1, t2, t3,
+                     best1_items, best2_items, best3_items, as_of):
+    return generate_pdf(
+        brand_name=brand_name, logo_reader=_get_image_reader(logo_path) if logo_path else None,
+        bg_hex=bg_hex, ink_hex=ink_hex, gold_hex=gold_hex,
+        guests=guests, gpt=gpt, t1=t1, t2=t2, t3=t3,
+        best1=dict(best1_items), best2=dict(best2_items), best3=dict(best3_items), as_of=as_of
+    )
+
+# ---------------- Email ----------------
 def mailto_link(brand, guests, gpt, best1, best2, best3):
     subject = f"{brand} • Caviar Event Calculator Results"
     body = f"""Caviar Event Calculator Results
@@ -461,6 +484,189 @@ Total cost: ${best3['total_cost']:.2f}
 """
     return "mailto:?subject=" + urllib.parse.quote(subject) + "&body=" + urllib.parse.quote(body)
 
-st.markdown(f"[📧 Email Results]({mailto_link(brand_name, guests, grams_per_tasting, best_1h, best_2h, best_3h)})")
+# ---------------- App ----------------
+def main():
+    # Streamlit runs the script as __main__; importing the module only defines the optimizer and helpers
+    st.set_page_config(page_title=APP_TITLE, page_icon="🥂", layout="centered")
+
+    # ---------------- Sidebar: Brand + Strategy ----------------
+    st.sidebar.header("Brand Settings")
+    st.sidebar.caption("Tip: Put your logo at ./assets/la-pearle-logo.png in the repo to load automatically.")
+    logo_url = st.sidebar.text_input("Logo URL (used if a local file isn't found)", "")
+    brand_name = st.sidebar.text_input("Brand Name", BRAND_NAME)
+
+    primary_hex = st.sidebar.color_picker("Primary (Gold)", PALETTE["gold"])
+    accent_hex  = st.sidebar.color_picker("Accent (Navy)",  PALETTE["navy"])
+    bg_hex      = st.sidebar.color_picker("Background",     "#FFFFFF")
+    panel_hex   = st.sidebar.color_picker("Panel Background", PALETTE["pearl"])
+
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("Mix Strategy")
+
+    objective = st.sidebar.selectbox(
+        "Objective Mode",
+        ["Fewest tins (recommended)", "Balanced mix (cost + per-tin penalty)", "Cheapest only"],
+        help="Choose how the optimizer ranks mixes."
+    )
+
+    service_penalty = st.sidebar.number_input(
+        "Per‑tin service penalty ($) — used only in Balanced mix",
+        min_value=0.0, value=8.0, step=1.0
+    )
+    st.sidebar.caption(
+        "❓ **What is the per‑tin service penalty?** "
+        "It's a small artificial cost added **per tin** *only* in **Balanced mix** mode to reflect real‑world setup/serving effort. "
+        "A higher penalty gently pushes the optimizer toward **fewer/larger tins**. "
+        "It is **ignored** in 'Fewest tins' and 'Cheapest only' modes."
+    )
+
+    cap_125_share_on = st.sidebar.checkbox("Limit 125 g share of total grams", value=True)
+    cap_125_share_pct = st.sidebar.slider("Max % of grams from 125 g", 20, 100, 60)
+
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("Advanced Caps (Optional)")
+    cap_250 = st.sidebar.number_input("Max 250 g tins", min_value=0, value=0, step=1, help="0 = no cap")
+    cap_8   = st.sidebar.number_input("Max 8 oz tins",  min_value=0, value=0, step=1, help="0 = no cap")
+    cap_125 = st.sidebar.number_input("Max 125 g tins", min_value=0, value=0, step=1, help="0 = no cap")
+
+    top_k = st.sidebar.number_input("Only Show Top ___ Mixes", min_value=1, value=10, step=1)
+
+    # ---------------- CSS ----------------
+    st.markdown(f"""
+    <style>
+    :root {{
+      --primary: {primary_hex};
+      --accent:  {accent_hex};
+      --bg:      {bg_hex};
+      --panel:   {panel_hex};
+      --ink:     {PALETTE['ink']};
+    }}
+    [data-testid="stAppViewContainer"] > .main {{ background: var(--bg); }}
+    .lp-banner {{
+      display:flex; align-items:center; gap:16px;
+      background: linear-gradient(90deg, var(--panel), #ffffff 70%);
+      padding: 14px 16px; border-radius: 16px; border: 1px solid #eee;
+      box-shadow: 0 1px 6px rgba(0,0,0,0.06);
+    }}
+    .lp-brand {{ font-size: 20px; font-weight: 700; color: var(--accent); }}
+    .lp-chip  {{ display:inline-block; padding: 2px 8px; border-radius: 999px; background: var(--primary); color: white; font-size: 12px; }}
+    .stButton>button {{ background: var(--primary); color:white; border:none; }}
+    </style>
+    """, unsafe_allow_html=True)
 
-st.caption("v4.2: Fixes Styler.hide_index compatibility; keeps bold Optimal mix and whole‑dollar Top Mixes.")
+    # ---------------- Header ----------------
+    col_logo, col_text = st.columns([1, 3])
+    with col_logo:
+        if FOUND_LOCAL_LOGO:
+            st.image(FOUND_LOCAL_LOGO, use_container_width=True)
+        elif logo_url.strip():
+            st.image(logo_url, use_container_width=True)
+        else:
+            st.markdown("<div class='lp-chip'>Add your logo via sidebar</div>", unsafe_allow_html=True)
+    with col_text:
+        st.markdown(f"""
+        <div class="lp-banner">
+          <div class="lp-brand">{brand_name}</div>
+          <div class="lp-chip">{APP_TITLE}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.write("Compute the lowest‑tin‑count **mix** that meets your required grams for **one‑hour**, **two‑hour**, and **three‑hour** events (while balancing cost and overage).")
+
+    # ---------------- Inputs ----------------
+    st.markdown("### Event Inputs")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        guests = st.number_input("Guests", min_value=1, value=90, step=1)
+    with col2:
+        grams_per_tasting = st.number_input("Grams per Tasting", min_value=1.0, value=3.0, step=0.5)
+    with col3:
+        tastings_per_guest_1h = st.number_input("Tastings per Guest (1 hour)", min_value=0.5, value=2.0, step=0.25)
+
+    c4, c5 = st.columns(2)
+    with c4:
+        tastings_per_guest_2h = st.number_input("Tastings per Guest (2 hours)", min_value=0.5, value=2.75, step=0.25)
+    with c5:
+        tastings_per_guest_3h = st.number_input("Tastings per Guest (3 hours)", min_value=0.5, value=3.5, step=0.25)
+
+    st.markdown("### Tin Sizes & Prices")
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        grams_250 = st.number_input("250 g - grams", min_value=1, value=250, step=1)
+        price_250 = st.number_input("250 g - price ($)", min_value=0.0, value=345.0, step=0.01, format="%.2f")
+    with c2:
+        grams_8 = st.number_input("8 oz - grams", min_value=1, value=227, step=1)
+        price_8 = st.number_input("8 oz - price ($)", min_value=0.0, value=312.0, step=0.01, format="%.2f")
+    with c3:
+        grams_7 = st.number_input("7 oz - grams", min_value=1, value=198, step=1)
+        price_7 = st.number_input("7 oz - price ($)", min_value=0.0, value=273.0, step=0.01, format="%.2f")
+    with c4:
+        grams_125 = st.number_input("125 g - grams", min_value=1, value=125, step=1)
+        price_125 = st.number_input("125 g - price ($)", min_value=0.0, value=127.57, step=0.01, format="%.2f")
+
+    # Required grams
+    req_1h = grams_required(guests, tastings_per_guest_1h, grams_per_tasting)
+    req_2h = grams_required(guests, tastings_per_guest_2h, grams_per_tasting)
+    req_3h = grams_required(guests, tastings_per_guest_3h, grams_per_tasting)
+
+    # Run optimizer (one shared search for all three events)
+    (best_1h, alt_1h), (best_2h, alt_2h), (best_3h, alt_3h) = optimize_and_rank_multi(
+        (req_1h, req_2h, req_3h), grams_250, price_250, grams_8, price_8, grams_7, price_7, grams_125, price_125,
+        objective=objective, service_penalty=service_penalty,
+        cap_125_share_on=cap_125_share_on, cap_125_share_pct=cap_125_share_pct,
+        cap_250=cap_250, cap_8=cap_8, cap_125=cap_125, top_k=top_k
+    )
+
+    # ---------------- Results ----------------
+    st.markdown("### Results")
+    render_block("One-Hour Event", best_1h, guests)
+    render_alternatives("One-Hour Event", alt_1h)
+
+    render_block("Two-Hour Event", best_2h, guests)
+    render_alternatives("Two-Hour Event", alt_2h)
+
+    render_block("Three-Hour Event", best_3h, guests)
+    render_alternatives("Three-Hour Event", alt_3h)
+
+    # ---------------- PDF Summary Sheet ----------------
+    st.markdown("### Summary Sheet (PDF)")
+
+    if not REPORTLAB_AVAILABLE:
+        st.info("To enable PDF export, add **reportlab** to your requirements.txt and redeploy.")
+    else:
+        pdf_logo = FOUND_LOCAL_LOGO if FOUND_LOCAL_LOGO else (logo_url if logo_url.strip() else None)
+        pdf_args = (
+            brand_name, pdf_logo, panel_hex, PALETTE["ink"], primary_hex,
+            guests, grams_per_tasting,
+            tastings_per_guest_1h, tastings_per_guest_2h, tastings_per_guest_3h,
+            tuple(best_1h.items()), tuple(best_2h.items()), tuple(best_3h.items()),
+            datetime.now().date()
+        )
+        if st.button("📄 Generate Summary Sheet"):
+            try:
+                pdf_bytes = _build_pdf_bytes(*pdf_args)
+            except Exception:
+                # Logo couldn't be read; build without it (the logo is retried next time)
+                pdf_bytes = _build_pdf_bytes(*(pdf_args[:1] + (None,) + pdf_args[2:]))
+            st.session_state["summary_pdf"] = (pdf_args, pdf_bytes)
+        # Keep the last generated PDF downloadable across reruns, but only while the inputs match it
+        stashed = st.session_state.get("summary_pdf")
+        if stashed and stashed[0] == pdf_args:
+            fname = f"Caviar_Event_Summary_{pdf_args[-1].strftime('%Y-%m-%d')}.pdf"
+            st.download_button("⬇️ Download PDF", data=stashed[1], file_name=fname, mime="application/pdf")
+        elif stashed:
+            del st.session_state["summary_pdf"]
+
+    # ---------------- Actions ----------------
+    st.markdown("### Actions")
+    st.components.v1.html("""
+    <script>function doPrint(){ window.print(); }</script>
+    <button onclick="doPrint()" style="padding:8px 12px;border-radius:8px;border:1px solid #ccc;cursor:pointer;">🖨️ Print Results</button>
+    """, height=60)
+
+    st.markdown(f"[📧 Email Results]({mailto_link(brand_name, guests, grams_per_tasting, best_1h, best_2h, best_3h)})")
+
+    st.caption("v4.2: Markdown event summaries with bold Optimal mix (no pandas Styler); whole‑dollar Top Mixes.")
+
+if __name__ == "__main__":
+    main()